@@ -1,16 +1,20 @@
 # build.spec
 # Run with: pyinstaller build.spec
+from PyInstaller.utils.hooks import collect_data_files, collect_dynamic_libs
+
 block_cipher = None
 
 a = Analysis(
     ['transcriber/cli.py'],
     pathex=['.'],
     hiddenimports=[],
-    datas=[            # ship Whisper models & ffmpeg
-        ('models', 'whisper/models'),
+    datas=[            # ship Whisper models, faster-whisper VAD assets & ffmpeg
+        ('models', 'models'),
+        *collect_data_files('faster_whisper'),
     ],
     binaries=[
         ('/usr/local/bin/ffmpeg', '.'),  # adjust for Windows path
+        *collect_dynamic_libs('ctranslate2'),
     ],
 )
 
@@ -1,53 +1,70 @@
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
-import subprocess
 import os
-import pathlib
 import sys
 import threading
-import importlib.util
 from queue import Queue, Empty
-import multiprocessing
-import torch
+import functools
 import logging
 import tempfile
 from datetime import datetime
 
-# Set up logging
+# Set up logging (set TRANSCRIBER_LOG=DEBUG or INFO for more detail)
 log_dir = tempfile.gettempdir()
 log_file = os.path.join(log_dir, f'transcriber_gui_{datetime.now():%Y%m%d_%H%M%S}.log')
+log_level = logging.getLevelName(os.environ.get('TRANSCRIBER_LOG', 'WARNING').upper())
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=log_level if isinstance(log_level, int) else logging.WARNING,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(log_file),
+        logging.FileHandler(log_file, delay=True),  # Only created once something is logged
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
-logger.info(f"Starting application. Log file: {log_file}")
-logger.info(f"Python version: {sys.version}")
-logger.info(f"System platform: {sys.platform}")
+logger.info("Starting application. Log file: %s", log_file)
+logger.info("Python version: %s", sys.version)
+logger.info("System platform: %s", sys.platform)
 
-# Configure PyTorch for single-threaded operation
-torch.set_num_threads(1)
+def get_num_threads() -> int:
+    """Get the number of compute threads, leaving one core free for the GUI.
+
+    Set TRANSCRIBER_NUM_THREADS to override (e.g. 1 when running several instances).
+    """
+    override = os.environ.get("TRANSCRIBER_NUM_THREADS")
+    if override:
+        try:
+            return max(1, int(override))
+        except ValueError:
+            logger.warning("Ignoring invalid TRANSCRIBER_NUM_THREADS: %r", override)
+    return max(1, min((os.cpu_count() or 2) - 1, 16))
+
+# Configure thread pools before the inference backend is imported so it picks them up
+num_threads = get_num_threads()
 os.environ.update({
-    "MKL_NUM_THREADS": "1",
-    "NUMEXPR_NUM_THREADS": "1",
-    "OMP_NUM_THREADS": "1",
-    "OPENBLAS_NUM_THREADS": "1"
+    "MKL_NUM_THREADS": str(num_threads),
+    "NUMEXPR_NUM_THREADS": str(num_threads),
+    "OMP_NUM_THREADS": str(num_threads),
+    "OPENBLAS_NUM_THREADS": str(num_threads)
 })
+logger.info("Using %d compute threads", num_threads)
 
+# File dialog filters
+AUDIO_FILETYPES = (("Audio/Video Files", "*.mp3 *.mp4 *.wav *.m4a *.mov"),)
+TEXT_FILETYPES = (("Text Files", "*.txt"),)
+
+@functools.lru_cache(maxsize=256)
 def normalize_path(path: str) -> str:
     """Convert path to absolute and normalize for platform compatibility."""
     if not path:
         return path
     try:
-        return str(pathlib.Path(os.path.expanduser(path)).resolve())
+        return os.path.abspath(os.path.expanduser(path))
     except Exception as e:
         logger.error(f"Path normalization failed: {e}", exc_info=True)
         return path
 
+@functools.lru_cache(maxsize=1)
 def get_bundle_dir() -> str:
     """Get the application's bundle directory."""
     try:
@@ -62,6 +79,12 @@ def get_bundle_dir() -> str:
         logger.error(f"Failed to get bundle directory: {e}", exc_info=True)
         return os.path.dirname(os.path.abspath(__file__))
 
+def summarize_error(error: Exception) -> str:
+    """Get a short one-line description of an error for display; details go to the log."""
+    lines = str(error).strip().splitlines()
+    first_line = lines[0][:200] if lines else ""
+    return f"{type(error).__name__}: {first_line}" if first_line else type(error).__name__
+
 class TranscriberGUI:
     def __init__(self, root):
         self.root = root
@@ -69,14 +92,30 @@ class TranscriberGUI:
         self.bundle_dir = get_bundle_dir()
         
         # Initialize transcription process tracking
-        self.transcription_thread = None
         self.is_transcribing = False
+        self.pending_jobs = 0
+
+        # Files selected together are transcribed one after another, each next to its input
+        self.batch_files = []
+
+        # Engine is created once and reused across transcriptions
+        self.engine = None
+        self.engine_lock = threading.Lock()
         
         self.setup_gui()
         self.message_queue = Queue()
-        self.check_message_queue()
+        # The worker signals new messages with a virtual event instead of the GUI polling
+        self.root.bind("<<TranscriberMsg>>", self.check_message_queue)
         logger.info("GUI initialized")
 
+        # A single long-lived worker runs jobs in order, reusing its thread and the engine
+        self.job_queue = Queue()
+        self.worker_thread = threading.Thread(target=self.run_worker, daemon=True)
+        self.worker_thread.start()
+
+        # Load the model in the background so the first click doesn't pay for it
+        self.job_queue.put((self.warmup_engine, ()))
+
     def setup_gui(self):
         """Set up the GUI elements."""
         # Main frame
@@ -88,21 +127,25 @@ class TranscriberGUI:
         # Input file selection
         ttk.Label(main_frame, text="Input File:").grid(row=0, column=0, sticky="w", pady=5)
         self.input_path = tk.StringVar()
-        ttk.Entry(main_frame, textvariable=self.input_path, width=50).grid(row=0, column=1, padx=5)
+        self.input_entry = ttk.Entry(main_frame, textvariable=self.input_path, width=50)
+        self.input_entry.grid(row=0, column=1, padx=5)
         ttk.Button(main_frame, text="Browse", command=self.select_input).grid(row=0, column=2)
 
         # Output file selection
         ttk.Label(main_frame, text="Output File:").grid(row=1, column=0, sticky="w", pady=5)
         self.output_path = tk.StringVar()
-        ttk.Entry(main_frame, textvariable=self.output_path, width=50).grid(row=1, column=1, padx=5)
-        ttk.Button(main_frame, text="Browse", command=self.select_output).grid(row=1, column=2)
+        self.output_entry = ttk.Entry(main_frame, textvariable=self.output_path, width=50)
+        self.output_entry.grid(row=1, column=1, padx=5)
+        self.output_btn = ttk.Button(main_frame, text="Browse", command=self.select_output)
+        self.output_btn.grid(row=1, column=2)
 
         # Progress display
         self.progress_var = tk.StringVar(value="Ready")
         ttk.Label(main_frame, textvariable=self.progress_var).grid(row=2, column=0, columnspan=3, pady=10)
 
         # Progress bar
-        self.progress_bar = ttk.Progressbar(main_frame, mode='indeterminate')
+        # Determinate and only redrawn when a segment arrives, rather than animated
+        self.progress_bar = ttk.Progressbar(main_frame, mode='determinate', maximum=100.0)
         self.progress_bar.grid(row=3, column=0, columnspan=3, sticky="ew", pady=5)
         self.progress_bar.grid_remove()
 
@@ -115,34 +158,58 @@ class TranscriberGUI:
             main_frame.columnconfigure(i, weight=1 if i == 1 else 0)
 
     def select_input(self):
-        """Handle input file selection."""
-        filename = filedialog.askopenfilename(
-            title="Select Audio/Video File",
-            filetypes=[("Audio/Video Files", "*.mp3 *.mp4 *.wav *.m4a *.mov")]
+        """Handle input file selection; several files are queued as a batch."""
+        filenames = filedialog.askopenfilenames(
+            title="Select Audio/Video Files",
+            filetypes=AUDIO_FILETYPES
         )
-        if filename:
-            norm_path = normalize_path(filename)
-            logger.info(f"Selected input file: {norm_path}")
-            self.input_path.set(norm_path)
+        if len(filenames) == 1:
+            filename = filenames[0]
+            # Normalization is deferred to start_transcription to keep the UI thread off the filesystem
+            logger.info(f"Selected input file: {filename}")
+            self.set_batch_mode([])
+            self.input_path.set(filename)
             
             # Set default output path
-            output = pathlib.Path(norm_path).with_suffix('.txt')
-            self.output_path.set(str(output))
+            self.output_path.set(os.path.splitext(filename)[0] + '.txt')
+        elif filenames:
+            logger.info(f"Selected {len(filenames)} input files")
+            self.set_batch_mode(list(filenames))
+            self.input_path.set(f"{len(filenames)} files selected")
+            self.output_path.set("Saved next to each input file (.txt)")
+
+    def set_batch_mode(self, filenames: list):
+        """Switch between a single editable input/output pair and a read-only batch of files."""
+        self.batch_files = filenames
+        state = 'readonly' if filenames else 'normal'
+        self.input_entry.config(state=state)
+        self.output_entry.config(state=state)
+        self.output_btn.config(state='disabled' if filenames else 'normal')
 
     def select_output(self):
         """Handle output file selection."""
         filename = filedialog.asksaveasfilename(
             title="Save Transcript As",
             defaultextension=".txt",
-            filetypes=[("Text Files", "*.txt")]
+            filetypes=TEXT_FILETYPES
         )
         if filename:
-            norm_path = normalize_path(filename)
-            logger.info(f"Selected output file: {norm_path}")
-            self.output_path.set(norm_path)
+            logger.info(f"Selected output file: {filename}")
+            self.output_path.set(filename)
+
+    def post_message(self, msg: dict):
+        """Queue a message from the worker thread and wake the Tk event loop to handle it."""
+        self.message_queue.put(msg)
+        try:
+            self.root.event_generate("<<TranscriberMsg>>", when="tail")
+        except (RuntimeError, tk.TclError):
+            # Window is being destroyed; nothing left to update
+            logger.debug("Could not notify GUI of message", exc_info=True)
 
-    def check_message_queue(self):
-        """Process messages from the transcription thread."""
+    def check_message_queue(self, event=None):
+        """Process all pending messages from the transcription thread."""
+        # Only the latest progress update is shown, so intermediate ones are dropped
+        latest_progress = None
         try:
             while True:
                 msg = self.message_queue.get_nowait()
@@ -150,50 +217,70 @@ class TranscriberGUI:
                 msg_text = msg.get('text', '')
                 
                 if msg_type == 'progress':
-                    self.progress_var.set(msg_text)
-                    logger.info(f"Progress: {msg_text}")
+                    latest_progress = msg
                 elif msg_type == 'complete':
+                    latest_progress = None
                     self.progress_var.set(msg_text)
-                    self.progress_bar.stop()
-                    self.progress_bar.grid_remove()
-                    self.transcribe_btn.config(state='normal')
-                    self.is_transcribing = False
+                    self.finish_job()
                     logger.info("Transcription complete")
                 elif msg_type == 'error':
+                    latest_progress = None
                     self.progress_var.set(f"Error: {msg_text}")
-                    self.progress_bar.stop()
-                    self.progress_bar.grid_remove()
-                    self.transcribe_btn.config(state='normal')
-                    self.is_transcribing = False
+                    self.finish_job()
                     logger.error(f"Transcription error: {msg_text}")
-                    messagebox.showerror("Error", msg_text)
+                    messagebox.showerror("Error", f"{msg_text}\n\nSee the log file for details: {log_file}")
         except Empty:
             pass
         finally:
-            self.root.after(100, self.check_message_queue)
+            if latest_progress is not None:
+                self.show_progress(latest_progress)
 
-    def validate_paths(self) -> bool:
-        """Validate input and output paths."""
-        input_file = self.input_path.get()
-        output_file = self.output_path.get()
+    def show_progress(self, msg: dict):
+        """Update the progress label and, when a completion percentage is known, the progress bar."""
+        self.progress_var.set(msg.get('text', ''))
+        logger.debug("Progress: %s", msg.get('text', ''))
+        if 'value' in msg:
+            self.progress_bar['value'] = msg['value']
+
+    def finish_job(self):
+        """Count a finished job and re-enable the GUI once the last queued one is done."""
+        self.pending_jobs -= 1
+        self.progress_bar['value'] = 0
+        if self.pending_jobs <= 0:
+            self.reset_progress_bar()
+            self.transcribe_btn.config(state='normal')
+            self.is_transcribing = False
+
+    def reset_progress_bar(self):
+        """Hide the progress bar and clear it for the next transcription."""
+        self.progress_bar['value'] = 0
+        self.progress_bar.grid_remove()
 
+    def validate_paths(self, input_file: str, output_file: str) -> bool:
+        """Validate input and output paths."""
         if not input_file:
             messagebox.showerror("Error", "Please select an input file")
             return False
 
-        if not os.path.exists(input_file):
+        try:
+            os.stat(input_file)
+        except OSError:
             messagebox.showerror("Error", f"Input file not found: {input_file}")
             return False
 
         try:
             output_dir = os.path.dirname(output_file) if output_file else None
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-            return True
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
         except Exception as e:
             messagebox.showerror("Error", f"Cannot access output location: {e}")
             return False
 
+        if not os.access(output_dir or '.', os.W_OK):
+            messagebox.showerror("Error", f"Cannot write to output location: {output_dir or os.getcwd()}")
+            return False
+        return True
+
     def start_transcription(self):
         """Start the transcription process."""
         # Prevent multiple transcription processes
@@ -201,65 +288,107 @@ class TranscriberGUI:
             logger.warning("Transcription already in progress")
             return
 
-        if not self.validate_paths():
+        if self.batch_files:
+            jobs = [
+                (normalize_path(path), normalize_path(os.path.splitext(path)[0] + '.txt'))
+                for path in self.batch_files
+            ]
+        else:
+            self.input_path.set(normalize_path(self.input_path.get()))
+            self.output_path.set(normalize_path(self.output_path.get()))
+            jobs = [(self.input_path.get(), self.output_path.get())]
+
+        if not all(self.validate_paths(input_file, output_file) for input_file, output_file in jobs):
             return
 
         self.is_transcribing = True
+        self.pending_jobs = len(jobs)
         self.transcribe_btn.config(state='disabled')
         self.progress_bar.grid()
-        self.progress_bar.start(10)
         self.progress_var.set("Transcribing... Please wait")
 
-        # Start transcription in a new thread
-        self.transcription_thread = threading.Thread(
-            target=self.run_transcription,
-            args=(self.input_path.get(), self.output_path.get()),
-            daemon=True
-        )
-        self.transcription_thread.start()
-        logger.info("Started transcription thread")
+        # Hand the jobs to the worker thread, which runs them in order
+        for input_file, output_file in jobs:
+            self.job_queue.put((self.run_transcription, (input_file, output_file)))
+        logger.info(f"Queued {len(jobs)} transcription job(s)")
+
+    def run_worker(self):
+        """Run queued jobs one at a time on the worker thread."""
+        while True:
+            func, args = self.job_queue.get()
+            try:
+                func(*args)
+            except Exception:
+                logger.error("Worker job failed", exc_info=True)
+
+    def get_engine(self):
+        """Return the shared WhisperEngine, creating and loading it on first use."""
+        with self.engine_lock:
+            if self.engine is None:
+                # Add bundle directory to Python path
+                if self.bundle_dir not in sys.path:
+                    sys.path.insert(0, self.bundle_dir)
+
+                # Deferred so the inference backend isn't loaded before the window appears
+                from transcriber.engine import WhisperEngine
+
+                engine = WhisperEngine(cpu_threads=num_threads)
+                engine.model  # Load weights while holding the lock
+                self.engine = engine
+            return self.engine
+
+    def warmup_engine(self):
+        """Load the model ahead of the first transcription."""
+        try:
+            self.get_engine()
+            logger.info("Engine warmup complete")
+        except Exception:
+            logger.warning("Engine warmup failed", exc_info=True)
 
     def run_transcription(self, input_file: str, output_file: str):
         """Run the transcription process in a separate thread."""
         try:
-            # Add bundle directory to Python path
-            if self.bundle_dir not in sys.path:
-                sys.path.insert(0, self.bundle_dir)
-
-            from transcriber.engine import WhisperEngine
-            
-            # Initialize engine and transcribe
-            engine = WhisperEngine()
+            engine = self.get_engine()
             logger.info(f"Processing file: {input_file}")
-            result = engine.transcribe(input_file)
 
-            # Save results
+            audio = engine.load_audio(input_file)
+            duration = len(audio) / 16000
+
+            # Write each segment as soon as it is decoded rather than buffering the transcript
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(result['text'])
+                for segment in engine.transcribe_segments(audio):
+                    f.write(segment['text'])
+                    f.flush()
+                    self.post_message({
+                        'type': 'progress',
+                        'text': f"{os.path.basename(input_file)}: transcribed {segment['end']:.1f}s of {duration:.1f}s",
+                        'value': min(100.0, 100.0 * segment['end'] / duration) if duration else 100.0
+                    })
             logger.info(f"Saved transcript to: {output_file}")
 
-            self.message_queue.put({
+            self.post_message({
                 'type': 'complete',
                 'text': f"Transcription complete! Saved to: {output_file}"
             })
 
         except Exception as e:
             logger.error("Transcription failed", exc_info=True)
-            self.message_queue.put({
+            self.post_message({
                 'type': 'error',
-                'text': str(e)
+                'text': summarize_error(e)
             })
 
 def main():
     """Start the application."""
     # Enable multiprocessing support for PyInstaller
+    import multiprocessing
     multiprocessing.freeze_support()
     
     try:
         root = tk.Tk()
         root.title("Audio Transcriber")
         
-        # Prevent multiple instances
+        # Create the application (one per window; thread count is set by get_num_threads)
         app = TranscriberGUI(root)
         
         # Configure window
@@ -6,7 +6,7 @@ block_cipher = None
 # Collect all necessary data files
 datas = [
     ('transcriber', 'transcriber'),  # Include the entire transcriber module
-    *collect_data_files('whisper'),  # Include whisper data files
+    *collect_data_files('faster_whisper'),  # Include faster-whisper assets (VAD model)
     *collect_data_files('tkinter'),  # Include tkinter data files
     *collect_data_files('soundfile'),  # Include soundfile data files
 ]
@@ -19,7 +19,7 @@ if os.path.exists('ffmpeg.exe'):
 a = Analysis(
     ['gui.py'],
     pathex=[],
-    binaries=[],
+    binaries=collect_dynamic_libs('ctranslate2'),
     datas=datas,
     hiddenimports=[
         'tkinter',
@@ -30,14 +30,15 @@ a = Analysis(
         'transcriber',
         'transcriber.engine',
         'transcriber.audio',
-        'whisper',
+        'faster_whisper',
+        'ctranslate2',
         'numpy',
         'numpy.core',
         'numpy.lib',
         'numpy.linspace',
-        'torch',
         'tqdm',
         'soundfile',
+        'soxr',
     ],
     hookspath=[],
     hooksconfig={},
@@ -1,14 +1,24 @@
-import whisper, shutil, pathlib, os
+import os, sys, shutil, pathlib
+from faster_whisper import download_model
 
-dst = pathlib.Path("models")
-dst.mkdir(exist_ok=True)
+# Model size to bundle (default: small); the engine loads models/<size> when present
+size = sys.argv[1] if len(sys.argv) > 1 else "small"
+dst = pathlib.Path("models") / size
+dst.mkdir(parents=True, exist_ok=True)
 
-# Load once to make sure it's cached locally …
-model = whisper.load_model("small")
+# Download once to make sure it's cached locally …
+cache_dir = pathlib.Path(download_model(size))
 
-# Find the cached file
-cache_dir = pathlib.Path.home() / ".cache" / "whisper"
-for f in cache_dir.glob("*.bin"):
-    if "small" in f.name:
-        shutil.copy2(f, dst / f.name)
-        print("Copied", f.name, "→ models/")
+# Link the cached CTranslate2 model files, copying only across filesystems
+for f in cache_dir.iterdir():
+    if not f.is_file():
+        continue
+    dst_file = dst / f.name
+    dst_file.unlink(missing_ok=True)
+    try:
+        os.link(f.resolve(), dst_file)
+        print("Linked", f.name, "→", dst)
+    except OSError:
+        # copyfile uses reflinks/in-kernel copies where the filesystem supports them
+        shutil.copyfile(f, dst_file)
+        print("Copied", f.name, "→", dst)
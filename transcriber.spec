@@ -1,11 +1,11 @@
 # -*- mode: python ; coding: utf-8 -*-
-
+from PyInstaller.utils.hooks import collect_data_files, collect_dynamic_libs
 
 a = Analysis(
     ['transcriber/cli.py'],
     pathex=[],
-    binaries=[('/opt/homebrew/bin/ffmpeg', '.')],
-    datas=[('models', 'whisper/models'), ('/Users/adalmia/Documents/projects/transcriber/.venv/lib/python3.12/site-packages/whisper/assets', 'whisper/assets')],
+    binaries=[('/opt/homebrew/bin/ffmpeg', '.'), *collect_dynamic_libs('ctranslate2')],
+    datas=[('models', 'models'), *collect_data_files('faster_whisper')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
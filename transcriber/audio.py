@@ -1,12 +1,15 @@
 import subprocess, sys, shutil
+import functools
 from pathlib import Path
+from typing import Optional
 import numpy as np
-import whisper
 import soundfile as sf
+import soxr
 import logging
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=1)
 def get_ffmpeg_path() -> str:
     """Get path to ffmpeg executable, using bundled version if available."""
     if getattr(sys, '_MEIPASS', None):
@@ -22,60 +25,64 @@ def get_ffmpeg_path() -> str:
     logger.debug(f"Using system ffmpeg: {system_ffmpeg}")
     return system_ffmpeg
 
-def load_audio(file_path: str) -> np.ndarray:
-    """Load and normalize audio file for transcription."""
+def read_soundfile(src_path: Path, sample_rate: int = 16000) -> Optional[np.ndarray]:
+    """Read a file libsndfile understands (WAV, FLAC, OGG, ...) as mono float32 samples at sample_rate.
+
+    Downmixing and resampling happen in-process. Returns None when soundfile
+    cannot read the file, so it can be decoded with FFmpeg instead.
+    """
     try:
-        file_path = str(Path(file_path).resolve())
-        logger.info(f"Loading audio file: {file_path}")
-        
-        # Try soundfile first for better performance
-        try:
-            data, sample_rate = sf.read(file_path)
-            logger.debug(f"Loaded audio: {data.shape}, {sample_rate}Hz")
-            
-            # Convert to mono if stereo
-            if len(data.shape) > 1:
-                data = data.mean(axis=1)
-                logger.debug("Converted stereo to mono")
-            
-            # For now, fall back to whisper if resampling needed
-            if sample_rate != 16000:
-                logger.info("Sample rate not 16kHz, using whisper loader")
-                return whisper.load_audio(file_path)
-            
-            return data
-            
-        except Exception as e:
-            logger.info(f"Soundfile failed, using whisper loader: {e}")
-            return whisper.load_audio(file_path)
-            
+        with sf.SoundFile(str(src_path)) as f:
+            file_rate = f.samplerate
+            data = f.read(dtype="float32", always_2d=False)
     except Exception as e:
-        logger.error(f"Failed to load audio: {e}", exc_info=True)
-        raise RuntimeError(f"Could not load audio file: {e}") from e
+        logger.debug(f"Could not read {src_path} with soundfile: {e}")
+        return None
+
+    logger.info(f"Read {file_rate}Hz audio directly: {src_path}")
+    if data.ndim > 1:
+        # Stays float32, allocating only the mono output
+        data = data.mean(axis=1, dtype=np.float32)
+        logger.debug("Converted to mono")
+    if file_rate != sample_rate:
+        logger.debug(f"Resampling {file_rate}Hz to {sample_rate}Hz")
+        data = soxr.resample(data, file_rate, sample_rate, quality="HQ")
+    return data
+
+def decode_to_array(src_path: Path, sample_rate: int = 16000) -> np.ndarray:
+    """Decode an audio/video file to mono float32 samples in memory, without a temp WAV."""
+    data = read_soundfile(src_path, sample_rate)
+    if data is not None:
+        return data
 
-def extract_wav(src_path: Path, dst_path: Path, sample_rate: int = 16000) -> None:
-    """Convert audio/video file to WAV format using FFmpeg."""
     try:
-        logger.info(f"Converting {src_path} to WAV")
+        logger.info(f"Decoding {src_path} with FFmpeg")
         cmd = [
             get_ffmpeg_path(),
-            "-y",  # Overwrite output
+            "-nostdin",
+            "-loglevel", "error",
+            "-threads", "0",
             "-i", str(src_path),
+            "-f", "s16le",  # Raw PCM to stdout
             "-ac", "1",  # Mono
             "-ar", str(sample_rate),
-            "-f", "wav",
-            str(dst_path)
+            "-acodec", "pcm_s16le",
+            "-"
         ]
-        
+
         logger.debug(f"Running: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
         if result.returncode != 0:
-            logger.error(f"FFmpeg failed:\n{result.stderr}")
-            raise RuntimeError(f"FFmpeg conversion failed with code {result.returncode}")
-        
-        logger.info(f"Successfully created WAV file: {dst_path}")
-        
+            stderr = result.stderr.decode(errors="replace")
+            logger.error(f"FFmpeg failed:\n{stderr}")
+            raise RuntimeError(f"FFmpeg decoding failed with code {result.returncode}")
+
+        audio = np.frombuffer(result.stdout, np.int16).astype(np.float32)
+        audio /= 32768.0
+        logger.debug(f"Decoded {len(audio)/sample_rate:.2f} seconds of audio")
+        return audio
+
     except Exception as e:
-        logger.error(f"Audio conversion failed: {e}", exc_info=True)
-        raise RuntimeError(f"Could not convert audio: {e}") from e
\ No newline at end of file
+        logger.error(f"Audio decoding failed: {e}", exc_info=True)
+        raise RuntimeError(f"Could not decode audio: {e}") from e
\ No newline at end of file
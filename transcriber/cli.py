@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 import pathlib
-import tempfile
 import click
-from transcriber.audio import extract_wav
+from transcriber.audio import decode_to_array
 from transcriber.engine import WhisperEngine
+from transcriber.server import DEFAULT_PORT, RemoteEngine
 
 @click.command(context_settings=dict(help_option_names=["-h", "--help"]))
 @click.argument("input_file", type=click.Path(exists=True, path_type=pathlib.Path))
@@ -13,11 +13,27 @@ from transcriber.engine import WhisperEngine
               help="Output TXT file (default: same name).txt")
 @click.option("-q", "--quiet", is_flag=True,
               help="Reduce terminal output")
+@click.option("--quality", is_flag=True,
+              help="Use beam search with temperature fallback (slower, better on difficult audio)")
+@click.option("-j", "--workers", default=1, show_default=True,
+              help="Transcribe this many pieces of the audio in parallel")
+@click.option("-b", "--batch-size", default=1, show_default=True,
+              help="Decode this many 30s windows per batch (faster on GPU, no context between windows)")
+@click.option("--server", is_flag=True,
+              help="Send the file to a running transcription server (python -m transcriber.server) "
+                   "instead of loading the model; model options are set by the server")
+@click.option("-p", "--port", default=DEFAULT_PORT, show_default=True,
+              help="Transcription server port (with --server)")
 def cli(
     input_file: pathlib.Path,
     model: str,
     output: pathlib.Path | None,
     quiet: bool,
+    quality: bool,
+    workers: int,
+    batch_size: int,
+    server: bool,
+    port: int,
 ):
     """
     Transcribe audio/video files with automatic translation to English.
@@ -29,29 +45,31 @@ def cli(
 
     if not quiet:
         click.echo(f"Processing: {input_file}")
-        click.echo(f"Using model: {model}")
+        click.echo(f"Using model: {f'server on port {port}' if server else model}")
         click.echo(f"Output will be saved to: {output}")
 
-    # Initialize engine
-    engine = WhisperEngine(model_size=model)
+    if server:
+        # The server keeps its model loaded and decodes the file itself
+        engine = RemoteEngine(port)
+        audio = input_file
+    else:
+        # Initialize engine
+        engine = WhisperEngine(model_size=model, quality=quality, workers=workers,
+                               batch_size=batch_size)
 
-    if not quiet:
-        click.echo("⏩  Extracting audio…")
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        wav_path = pathlib.Path(tmpdir) / "audio.wav"
-        extract_wav(input_file, wav_path)
-        
-        if not quiet:
-            click.echo("📝  Transcribing and translating to English... (this may take a while)")
-        
-        result = engine.transcribe_wav(wav_path)
-        
-        # Write to file
-        output.write_text(result, encoding="utf-8")
-        
         if not quiet:
-            click.echo(f"✅  Saved transcript to {output}")
+            click.echo("⏩  Extracting audio…")
+
+        audio = decode_to_array(input_file)
+
+    if not quiet:
+        click.echo("📝  Transcribing and translating to English... (this may take a while)")
+
+    # Segments are written as they are decoded
+    engine.write_transcript(audio, output)
+
+    if not quiet:
+        click.echo(f"✅  Saved transcript to {output}")
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file
@@ -1,108 +1,272 @@
 from __future__ import annotations
 from pathlib import Path
-import whisper
-import time
-from typing import Optional, Dict, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import itertools
+import os
+import sys
+from typing import Optional, Dict, Iterator, List, Tuple, Union
 import numpy as np
 import logging
-import torch
+import ctranslate2
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.vad import get_speech_timestamps
+from transcriber.audio import decode_to_array
 
 logger = logging.getLogger(__name__)
 
+# Greedy decoding, no temperature fallback: fast and accurate enough for clean audio
+FAST_OPTIONS = {
+    'beam_size': 1,
+    'best_of': 1,
+    'temperature': 0.0,
+}
+
+# Beam search with sampling fallbacks for difficult audio
+QUALITY_OPTIONS = {
+    'beam_size': 3,
+    'best_of': 3,
+    'temperature': [0.0, 0.2, 0.4],
+}
+
+# Peak amplitude below which audio is treated as silent (-60 dBFS)
+SILENCE_PEAK = 1e-3
+
+# Number of most recent segments used as the prompt for the next chunk
+PROMPT_SEGMENTS = 8
+
+def get_model_path(model_size: str) -> str:
+    """Get a local model directory fetched by scripts/fetch_model.py, or the size name to download.
+
+    Looks in models/ next to the package, or in the PyInstaller bundle when frozen.
+    """
+    base_dir = Path(getattr(sys, '_MEIPASS', Path(__file__).resolve().parent.parent))
+    local_model = base_dir / "models" / model_size
+    if (local_model / "model.bin").exists():
+        return str(local_model)
+    return model_size
+
+@functools.lru_cache(maxsize=4)
+def get_model(
+    model_size: str, device: str, compute_type: str, cpu_threads: int, num_workers: int = 1
+) -> WhisperModel:
+    """Load a Whisper model, shared by all engines in the process with the same settings"""
+    logger.info(f"Loading Whisper model {model_size} on device: {device} ({compute_type})")
+    return WhisperModel(
+        get_model_path(model_size),
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+    )
+
+def split_on_silence(audio: np.ndarray, max_length: int) -> List[Tuple[int, int]]:
+    """Split audio into (start, end) sample ranges of at most max_length.
+
+    Cuts are placed in the middle of pauses between speech; a range is only cut
+    mid-speech when there is no pause within max_length.
+    """
+    if len(audio) <= max_length:
+        return [(0, len(audio))]
+
+    speech = get_speech_timestamps(audio)
+    pauses = [(before["end"] + after["start"]) // 2 for before, after in zip(speech, speech[1:])]
+    bounds = [0]
+    previous = 0
+    for pause in pauses + [len(audio)]:
+        while pause - bounds[-1] > max_length:
+            # Cut at the latest pause that keeps the range short enough
+            bounds.append(previous if previous > bounds[-1] else bounds[-1] + max_length)
+        previous = pause
+    bounds.append(len(audio))
+    return list(zip(bounds, bounds[1:]))
+
 class WhisperEngine:
-    """Whisper engine that handles transcription and translation to English."""
-    
-    def __init__(self, model_size: str = "medium"):
+    """Whisper engine that handles transcription and translation to English.
+
+    Runs on faster-whisper (CTranslate2) on the GPU when CUDA is available,
+    with float16 weights on GPU and int8 on CPU. Pass compute_type or set
+    TRANSCRIBER_COMPUTE_TYPE to override the quantization (e.g. int8_float16).
+    With batch_size > 1, several 30s windows are decoded per forward pass,
+    which keeps a GPU busy but drops text conditioning between windows.
+    """
+
+    def __init__(
+        self,
+        model_size: str = "medium",
+        cpu_threads: int = 0,
+        device: Optional[str] = None,
+        compute_type: Optional[str] = None,
+        quality: bool = False,
+        workers: int = 1,
+        batch_size: int = 1,
+    ):
         self.model_size = model_size
+        self.quality = quality
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        # Split the thread budget between workers to avoid oversubscription
+        self.cpu_threads = max(1, (cpu_threads or os.cpu_count() or 4) // self.workers)
+        self.device = device or ("cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu")
+        self.compute_type = compute_type or os.environ.get(
+            "TRANSCRIBER_COMPUTE_TYPE", "float16" if self.device == "cuda" else "int8"
+        )
         self._model = None
+        self._pipeline = None
+        self._options = None
         self.chunk_size = 24 * 60  # 24 minutes chunks
         logger.info(f"Initializing WhisperEngine with model size: {model_size}")
-        
+
     @property
-    def model(self) -> whisper.Whisper:
+    def model(self) -> WhisperModel:
         """Lazy load the Whisper model"""
         if self._model is None:
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            logger.info(f"Loading Whisper model on device: {device}")
-            self._model = whisper.load_model(self.model_size).to(device)
-            if device == "cuda":
-                self._model = self._model.half()
+            self._model = get_model(
+                self.model_size, self.device, self.compute_type, self.cpu_threads, self.workers
+            )
         return self._model
 
+    @property
+    def pipeline(self) -> BatchedInferencePipeline:
+        """Batched inference wrapper around the model"""
+        if self._pipeline is None:
+            self._pipeline = BatchedInferencePipeline(model=self.model)
+        return self._pipeline
+
     def get_transcription_options(self) -> dict:
-        """Get optimized transcription options based on device"""
-        device = next(self.model.parameters()).device
-        return {
-            'task': 'translate',
-            'word_timestamps': True,
-            'best_of': 3,
-            'beam_size': 3,
-            'temperature': [0.0, 0.2, 0.4],
-            'condition_on_previous_text': True,
-            'fp16': device.type == "cuda"
-        }
+        """Get transcription options for the selected speed/quality trade-off (built once per engine)"""
+        if self._options is None:
+            self._options = {
+                'task': 'translate',
+                'vad_filter': True,
+                **(QUALITY_OPTIONS if self.quality else FAST_OPTIONS),
+            }
+            if self.batch_size > 1:
+                self._options['batch_size'] = self.batch_size
+            else:
+                self._options['condition_on_previous_text'] = True
+        return self._options
+
+    @staticmethod
+    def load_audio(path: Union[str, Path]) -> np.ndarray:
+        """Load audio as 16kHz mono float32 samples."""
+        logger.info(f"Loading audio from: {path}")
+        audio = decode_to_array(Path(path))
+        logger.debug(f"Audio loaded, length: {len(audio)/16000:.2f} seconds")
+        return audio
 
     def transcribe(self, audio: Union[str, np.ndarray]) -> Dict:
         """Transcribe audio and translate to English."""
+        logger.info("Starting transcription")
+        segments = list(self.transcribe_segments(audio))
+        logger.info("Transcription complete")
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+        }
+
+    def transcribe_segments(self, audio: Union[str, np.ndarray]) -> Iterator[Dict]:
+        """Transcribe audio, yielding segments as soon as they are decoded.
+
+        Long audio is processed in chunks, split in pauses between speech, to
+        bound memory; segment timestamps are relative to the start of the full audio.
+        """
         try:
             # Load audio if path provided
             if isinstance(audio, (str, Path)):
-                logger.info(f"Loading audio from: {audio}")
-                audio = whisper.load_audio(str(audio))
-                logger.debug(f"Audio loaded, length: {len(audio)/16000:.2f} seconds")
-
-            # Process in chunks if audio is long
-            if len(audio) > self.chunk_size * 16000:
-                return self._process_long_audio(audio)
-            
-            # Process normally for shorter audio
-            logger.info("Starting transcription")
-            result = self.model.transcribe(audio, **self.get_transcription_options())
-            logger.info("Transcription complete")
-            return result
+                audio = self.load_audio(audio)
+
+            # Nothing to transcribe; avoid loading the model at all
+            if audio.size == 0 or max(audio.max(), -audio.min()) < SILENCE_PEAK:
+                logger.info("Audio is empty or silent, skipping transcription")
+                return
+
+            if self.workers > 1:
+                yield from self._transcribe_parallel(audio)
+                return
+
+            # Carry context across chunk boundaries, as Whisper does between its 30s windows;
+            # kept across chunks so one without speech doesn't drop the earlier context
+            recent_texts = deque(maxlen=PROMPT_SEGMENTS)
+            for start, end in split_on_silence(audio, self.chunk_size * 16000):
+                prompt = "".join(recent_texts).strip() if self.batch_size == 1 else None
+                for segment in self._transcribe_chunk(audio[start:end], start / 16000, prompt):
+                    recent_texts.append(segment["text"])
+                    yield segment
 
         except Exception as e:
             logger.error(f"Transcription failed: {str(e)}", exc_info=True)
             raise RuntimeError(f"Transcription failed: {str(e)}") from e
 
-    def _process_long_audio(self, audio: np.ndarray) -> Dict:
-        """Process long audio in chunks"""
-        logger.info("Processing long audio in chunks")
-        chunk_length = self.chunk_size * 16000
-        chunks = [audio[i:i + chunk_length] for i in range(0, len(audio), chunk_length)]
-        
-        results = []
-        for i, chunk in enumerate(chunks, 1):
-            logger.info(f"Processing chunk {i}/{len(chunks)}")
-            chunk_result = self.model.transcribe(chunk, **self.get_transcription_options())
-            
-            # Adjust timestamps for chunks after the first
-            if i > 1:
-                for segment in chunk_result["segments"]:
-                    segment["start"] += (i-1) * self.chunk_size
-                    segment["end"] += (i-1) * self.chunk_size
-            
-            results.append(chunk_result)
-        
-        # Merge results
-        final_result = results[0]
-        final_result["text"] = " ".join(r["text"] for r in results)
-        final_result["segments"] = [s for r in results for s in r["segments"]]
-        
-        logger.info("Long audio processing complete")
-        return final_result
-
-    def transcribe_wav(self, wav_path: Path) -> str:
-        """Transcribe audio file and return formatted text with timestamps."""
-        result = self.transcribe(str(wav_path))
-        return "\n".join(
-            f"[{format_timestamp(segment['start'])}] {segment['text'].strip()}"
-            for segment in result["segments"]
-        )
+    def _transcribe_parallel(self, audio: np.ndarray) -> Iterator[Dict]:
+        """Transcribe pieces split at pauses concurrently, yielding segments in order.
+
+        CTranslate2 releases the GIL, so worker threads run the model in parallel.
+        """
+        # Aim for one piece per worker, within the usual chunk size
+        max_length = min(self.chunk_size * 16000, max(30 * 16000, -(-len(audio) // self.workers)))
+        pieces = split_on_silence(audio, max_length)
+        logger.info(f"Transcribing {len(pieces)} pieces with {self.workers} workers")
+
+        def transcribe_piece(bounds: Tuple[int, int]) -> List[Dict]:
+            start, end = bounds
+            return list(self._transcribe_chunk(audio[start:end], start / 16000))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for segments in pool.map(transcribe_piece, pieces):
+                yield from segments
+
+    def _transcribe_chunk(
+        self, audio: np.ndarray, offset: float, prompt: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """Transcribe one chunk, shifting segment timestamps by offset seconds"""
+        model = self.pipeline if self.batch_size > 1 else self.model
+        options = self.get_transcription_options()
+        if prompt:
+            options = {**options, 'initial_prompt': prompt}
+        segments, _ = model.transcribe(audio, **options)
+        for segment in segments:
+            yield {
+                "start": segment.start + offset,
+                "end": segment.end + offset,
+                "text": segment.text,
+            }
+
+    def transcribe_wav(self, audio: Union[Path, np.ndarray]) -> str:
+        """Transcribe audio file or samples and return formatted text with timestamps."""
+        return "\n".join(format_transcript_lines(self.transcribe(audio)["segments"]))
+
+    def write_transcript(self, audio: Union[Path, np.ndarray], output_file: Path) -> None:
+        """Transcribe audio and write formatted text with timestamps as segments are decoded."""
+        segments = self.transcribe_segments(audio)
+        with open(output_file, "w", encoding="utf-8") as f:
+            separator = ""
+            # Format in small batches so timestamps stay vectorized without buffering the transcript
+            while batch := list(itertools.islice(segments, 32)):
+                f.write(separator + "\n".join(format_transcript_lines(batch)))
+                separator = "\n"
 
 def format_timestamp(seconds: float) -> str:
     """Format seconds into HH:MM:SS"""
     hours = int(seconds // 3600)
     minutes = int((seconds % 3600) // 60)
     seconds = int(seconds % 60)
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
\ No newline at end of file
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+def format_timestamps(seconds: np.ndarray) -> List[str]:
+    """Format an array of seconds into HH:MM:SS strings in one vectorized pass"""
+    hours, remainder = np.divmod(seconds.astype(np.int64), 3600)
+    minutes, secs = np.divmod(remainder, 60)
+    return [
+        f"{h:02d}:{m:02d}:{s:02d}"
+        for h, m, s in zip(hours.tolist(), minutes.tolist(), secs.tolist())
+    ]
+
+def format_transcript_lines(segments: List[Dict]) -> List[str]:
+    """Format segments as "[HH:MM:SS] text" transcript lines"""
+    starts = np.fromiter((segment["start"] for segment in segments), dtype=np.float64, count=len(segments))
+    return [
+        f"[{timestamp}] {segment['text'].strip()}"
+        for timestamp, segment in zip(format_timestamps(starts), segments)
+    ]
\ No newline at end of file
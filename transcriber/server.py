@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Local transcription server that keeps a Whisper model loaded between CLI runs.
+
+Start it once with `python -m transcriber.server`, then pass `--server` to the
+CLI so each run skips model loading.
+"""
+import os
+import pathlib
+import logging
+import secrets
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+from typing import Tuple, Union
+import click
+import numpy as np
+from transcriber.engine import WhisperEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 48213
+
+def get_address(port: int = DEFAULT_PORT) -> Tuple[str, int]:
+    """Get the server address; only the local machine can connect."""
+    return ("localhost", port)
+
+def get_key_path(port: int = DEFAULT_PORT) -> pathlib.Path:
+    """Get the file holding the running server's key, in a directory private to the current user."""
+    base_dir = os.environ.get("XDG_RUNTIME_DIR") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(base_dir) / "transcriber" / f"server-{port}.key"
+
+def write_authkey(authkey: bytes, port: int = DEFAULT_PORT) -> pathlib.Path:
+    """Save the server's key so that only the current user's clients can connect."""
+    key_path = get_key_path(port)
+    key_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # Fails unless we own the directory; the key must not be readable by other users
+    os.chmod(key_path.parent, 0o700)
+    key_path.unlink(missing_ok=True)
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(authkey)
+    return key_path
+
+def read_authkey(port: int = DEFAULT_PORT) -> bytes:
+    """Read the key written by the server running on this port."""
+    try:
+        return get_key_path(port).read_bytes()
+    except FileNotFoundError as e:
+        raise RuntimeError(f"No transcription server running on port {port}") from e
+
+def serve(engine: WhisperEngine, port: int = DEFAULT_PORT) -> None:
+    """Load the engine's model and answer transcription requests until interrupted.
+
+    Connections are authenticated with a random key generated for this run, so
+    only processes of the same user can send requests (which are pickled).
+    """
+    engine.model  # Load before accepting requests
+    authkey = secrets.token_bytes(32)
+    with Listener(get_address(port), authkey=authkey) as listener:
+        # Written only once the port is ours, so a failed start never replaces a running server's key
+        key_path = write_authkey(authkey, port)
+        try:
+            logger.info(f"Transcription server listening on port {port}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, OSError, EOFError) as e:
+                    # Wrong key, dropped connection or not a multiprocessing client (e.g. a port scan)
+                    logger.warning(f"Rejected connection: {e!r}")
+                    continue
+                with conn:
+                    try:
+                        request = conn.recv()
+                        logger.info("Received transcription request")
+                        conn.send({"text": engine.transcribe_wav(request["audio"])})
+                    except Exception as e:
+                        logger.error(f"Request failed: {e}", exc_info=True)
+                        try:
+                            conn.send({"error": str(e)})
+                        except OSError:
+                            logger.warning("Client disconnected before the error could be sent")
+        finally:
+            key_path.unlink(missing_ok=True)
+
+class RemoteEngine:
+    """Client for a running transcription server, with the same transcribe_wav API as WhisperEngine."""
+
+    def __init__(self, port: int = DEFAULT_PORT):
+        self.port = port
+
+    def transcribe_wav(self, audio: Union[pathlib.Path, np.ndarray]) -> str:
+        """Transcribe audio file or samples on the server and return formatted text with timestamps."""
+        # Paths are decoded by the server so the samples never cross the socket
+        if not isinstance(audio, np.ndarray):
+            audio = str(pathlib.Path(audio).resolve())
+
+        try:
+            with Client(get_address(self.port), authkey=read_authkey(self.port)) as conn:
+                conn.send({"audio": audio})
+                response = conn.recv()
+        except ConnectionRefusedError as e:
+            raise RuntimeError(f"No transcription server running on port {self.port}") from e
+        except AuthenticationError as e:
+            # Also protects the client: a process squatting on the port cannot answer the challenge
+            raise RuntimeError(f"Process on port {self.port} is not this user's transcription server") from e
+
+        if "error" in response:
+            raise RuntimeError(f"Transcription failed on server: {response['error']}")
+        return response["text"]
+
+    def write_transcript(self, audio: Union[pathlib.Path, np.ndarray], output_file: pathlib.Path) -> None:
+        """Transcribe audio on the server and write formatted text with timestamps."""
+        pathlib.Path(output_file).write_text(self.transcribe_wav(audio), encoding="utf-8")
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.option("-m", "--model", default="medium", show_default=True,
+              help="Whisper model size (tiny|base|small|medium|large)")
+@click.option("--quality", is_flag=True,
+              help="Use beam search with temperature fallback (slower, better on difficult audio)")
+@click.option("-j", "--workers", default=1, show_default=True,
+              help="Transcribe this many pieces of the audio in parallel")
+@click.option("-b", "--batch-size", default=1, show_default=True,
+              help="Decode this many 30s windows per batch (faster on GPU, no context between windows)")
+@click.option("-p", "--port", default=DEFAULT_PORT, show_default=True,
+              help="Local port to listen on")
+def main(model: str, quality: bool, workers: int, batch_size: int, port: int):
+    """
+    Keep a Whisper model loaded and serve transcription requests from the CLI.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    engine = WhisperEngine(model_size=model, quality=quality, workers=workers,
+                           batch_size=batch_size)
+    click.echo(f"Loading {model} model…")
+    try:
+        serve(engine, port)
+    except KeyboardInterrupt:
+        click.echo("Server stopped")
+
+if __name__ == "__main__":
+    main()